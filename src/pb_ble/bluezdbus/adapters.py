@@ -1,17 +1,26 @@
+import asyncio
 import logging
 from pprint import pformat
 
 from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.signals import MatchRules, add_match
+from bleak.backends.bluezdbus.utils import assert_reply
 from bluetooth_adapters import (
     AdapterDetails,
     get_adapters,
 )
+from dbus_fast import Message, MessageType
 from dbus_fast.aio import MessageBus, ProxyObject
 
 logger = logging.getLogger(__name__)
 
+_DBUS_SERVICE = "org.freedesktop.DBus"
+
 adapters = get_adapters()
 
+_adapter_caches: "dict[MessageBus, _AdapterCache]" = {}
+"""Adapter caches of the message buses subscribed to BlueZ adapter changes."""
+
 
 class AdapterDetailsExt(AdapterDetails):
     """
@@ -25,7 +34,161 @@ class AdapterDetailsExt(AdapterDetails):
     """Whether the adapter is powered on."""
 
 
-async def get_all_adapter_details() -> dict[str, AdapterDetailsExt]:
+def _is_adapter_path(path: str) -> bool:
+    """Checks whether the given D-Bus object path is a BlueZ adapter."""
+    return path.startswith("/org/bluez/") and path.count("/") == 3
+
+
+class _AdapterCache:
+    """
+    Adapter details and proxy objects cached for one message bus. Invalidated
+    when BlueZ signals an adapter change on that bus.
+    """
+
+    def __init__(self) -> None:
+        self.details: dict[str, AdapterDetailsExt] | None = None
+        """Cached adapter details, keyed by adapter name."""
+        self.proxies: dict[str, ProxyObject] = {}
+        """Cached adapter proxy objects, keyed by adapter name."""
+        self.generation = 0
+        """Incremented on every invalidation, to detect changes during a lookup."""
+
+    def invalidate(self, proxies: bool = True) -> None:
+        """
+        Invalidates the cached adapter details and proxy objects.
+
+        :param proxies: Whether to invalidate the proxy objects, defaults to `True`.
+            Only needed when the adapter interfaces change.
+        """
+        self.generation += 1
+        self.details = None
+        if proxies:
+            self.proxies.clear()
+
+    def on_message(self, message: Message) -> None:
+        """
+        Invalidates the cache when an adapter is added or removed, when the
+        properties of an adapter change, or when the BlueZ service restarts.
+
+        Property changes do not affect the proxy objects, so only the adapter
+        details are invalidated for those.
+        """
+        if message.message_type != MessageType.SIGNAL:
+            return
+
+        if message.interface == _DBUS_SERVICE and message.member == "NameOwnerChanged":
+            if message.body[0] == defs.BLUEZ_SERVICE:
+                logger.debug("BlueZ service changed owner, invalidating adapters")
+                self.invalidate()
+            return
+
+        if message.interface == defs.OBJECT_MANAGER_INTERFACE and message.member in (
+            "InterfacesAdded",
+            "InterfacesRemoved",
+        ):
+            path = message.body[0]
+            proxies = True
+        elif (
+            message.interface == defs.PROPERTIES_INTERFACE
+            and message.member == "PropertiesChanged"
+            and message.body[0] == defs.ADAPTER_INTERFACE
+        ):
+            path = message.path
+            proxies = False
+        else:
+            return
+
+        if _is_adapter_path(path):
+            logger.debug("Adapter changed, invalidating adapters: %s", path)
+            self.invalidate(proxies)
+
+
+async def _watch_adapters(bus: MessageBus) -> _AdapterCache:
+    """
+    Subscribes the given message bus to BlueZ adapter changes, so that
+    its cached adapter details are kept up to date. Each bus subscribes
+    only once.
+
+    :param bus: The connected message bus.
+    :return: The adapter cache of the message bus.
+    """
+    if (cache := _adapter_caches.get(bus)) is not None:
+        return cache
+
+    # Disconnected buses lost their subscriptions with the connection
+    for other in [other for other in _adapter_caches if not other.connected]:
+        del _adapter_caches[other]
+
+    cache = _adapter_caches[bus] = _AdapterCache()
+    bus.add_message_handler(cache.on_message)
+
+    try:
+        await _add_adapter_matches(bus)
+    except BaseException:
+        del _adapter_caches[bus]
+        bus.remove_message_handler(cache.on_message)
+        raise
+
+    return cache
+
+
+async def _add_adapter_matches(bus: MessageBus) -> None:
+    """
+    Adds the match rules for BlueZ adapter changes to the given message bus.
+
+    :param bus: The message bus.
+    """
+    for rules in (
+        MatchRules(
+            sender=_DBUS_SERVICE,
+            interface=_DBUS_SERVICE,
+            member="NameOwnerChanged",
+            arg0=defs.BLUEZ_SERVICE,
+        ),
+        MatchRules(
+            interface=defs.OBJECT_MANAGER_INTERFACE,
+            member="InterfacesAdded",
+            arg0path="/org/bluez/",
+        ),
+        MatchRules(
+            interface=defs.OBJECT_MANAGER_INTERFACE,
+            member="InterfacesRemoved",
+            arg0path="/org/bluez/",
+        ),
+        MatchRules(
+            interface=defs.PROPERTIES_INTERFACE,
+            member="PropertiesChanged",
+            arg0=defs.ADAPTER_INTERFACE,
+            path_namespace="/org/bluez",
+        ),
+    ):
+        assert_reply(await add_match(bus, rules))
+
+
+async def get_all_adapter_details(
+    bus: MessageBus | None = None,
+) -> dict[str, AdapterDetailsExt]:
+    """
+    Looks up the details of all Bluetooth adapters known to BlueZ.
+
+    Looking up the adapter details is expensive: it queries all objects
+    managed by BlueZ and probes the underlying devices. If a message bus
+    is given, the result is cached and only refreshed after BlueZ signals
+    that an adapter was added, removed or changed.
+
+    :param bus: The message bus to watch for adapter changes, defaults to
+        `None` (no caching).
+    :return: The adapter details, keyed by adapter name.
+    """
+    cache = None
+    if bus is not None and bus.connected:
+        cache = await _watch_adapters(bus)
+        if cache.details is not None:
+            return cache.details
+
+        # An adapter change during the refresh makes its result outdated
+        generation = cache.generation
+
     await adapters.refresh()
     adapters_ext = {}
 
@@ -42,13 +205,17 @@ async def get_all_adapter_details() -> dict[str, AdapterDetailsExt]:
             **details, advertise=advertise, powered=powered
         )
 
+    if cache is not None and generation == cache.generation:
+        cache.details = adapters_ext
+
     return adapters_ext
 
 
 async def get_adapter_details(
     adapter_name: str = adapters.default_adapter,
+    bus: MessageBus | None = None,
 ) -> tuple[str, AdapterDetailsExt]:
-    adapters = await get_all_adapter_details()
+    adapters = await get_all_adapter_details(bus)
     if adapter_name not in adapters:
         raise ValueError(f"Adapter '{adapter_name}' not available")
     return adapter_name, adapters[adapter_name]
@@ -57,7 +224,40 @@ async def get_adapter_details(
 async def get_adapter(
     bus: MessageBus, adapter_name: str = adapters.default_adapter
 ) -> ProxyObject:
-    name, details = await get_adapter_details(adapter_name)
+    """
+    Looks up the proxy object of a Bluetooth adapter.
+
+    The proxy object is cached per message bus, until BlueZ signals that the
+    adapter was removed. A cached proxy is returned without waiting for
+    signals that are not dispatched yet, so it may refer to an adapter that
+    was removed just now. Method calls on it then fail with a `DBusError`.
+
+    :param bus: The message bus.
+    :param adapter_name: The Bluetooth adapter name, defaults to the default adapter.
+    :raises ValueError: If the adapter is not available.
+    :return: The adapter proxy object.
+    """
+    cache = None
+    if bus.connected:
+        cache = await _watch_adapters(bus)
+        if adapter := cache.proxies.get(adapter_name):
+            return adapter
+
+        # An adapter change during the lookup makes the proxy outdated
+        generation = cache.generation
+
+    adapter_path = f"/org/bluez/{adapter_name}"
+
+    # Introspect the adapter while its details are looked up
+    introspection = asyncio.ensure_future(
+        bus.introspect(defs.BLUEZ_SERVICE, adapter_path)
+    )
+
+    try:
+        name, details = await get_adapter_details(adapter_name, bus)
+    except BaseException:
+        introspection.cancel()
+        raise
 
     logger.info(f"Using Bluetooth adapter '{name}': {pformat(details)}")
 
@@ -71,9 +271,8 @@ async def get_adapter(
             f"Bluetooth adapter '{name}' does not support broadcasting BLE advertisements!"
         )
 
-    adapter_path = f"/org/bluez/{name}"
-    adapter_node = await bus.introspect(defs.BLUEZ_SERVICE, adapter_path)
-    adapter: ProxyObject = bus.get_proxy_object(
-        defs.BLUEZ_SERVICE, adapter_path, adapter_node
-    )
+    adapter_node = await introspection
+    adapter = bus.get_proxy_object(defs.BLUEZ_SERVICE, adapter_path, adapter_node)
+    if cache is not None and generation == cache.generation:
+        cache.proxies[name] = adapter
     return adapter
@@ -26,7 +26,12 @@ from ..constants import (
     LEGO_CID,
     PybricksBroadcastData,
 )
-from ..messages import decode_message, encode_message
+from ..messages import (
+    ENCODED_MESSAGE_MAX_SIZE,
+    _make_int_message_encoder,
+    decode_message,
+    encode_message_into,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -469,6 +474,10 @@ class PybricksBroadcastAdvertisement(BroadcastAdvertisement):
         on_release: Callable[[str], None] = lambda path: None,
     ):
         super().__init__(local_name, channel, on_release)
+        # Reusable buffer for encoding messages
+        self._message_buf = bytearray(ENCODED_MESSAGE_MAX_SIZE)
+        # Specialised encoder for the common case of a single int value
+        self._encode_int_message = _make_int_message_encoder(channel)
         if data:
             self.message = data
 
@@ -490,8 +499,17 @@ class PybricksBroadcastAdvertisement(BroadcastAdvertisement):
 
     @message.setter
     def message(self, value: PybricksBroadcastData):
-        value = value if isinstance(value, tuple) else (value,)
-        message = encode_message(self.channel, *value)
+        if type(value) is int:
+            message = self._encode_int_message(value)
+        else:
+            value = value if isinstance(value, tuple) else (value,)
+            size = encode_message_into(self._message_buf, self.channel, *value)
+            # D-Bus holds on to the property value, so it must not share the buffer
+            message = bytes(memoryview(self._message_buf)[:size])
+        current = self._manufacturer_data.get(self.LEGO_CID)
+        if current is not None and current.value == message:  # type: ignore
+            # Unchanged, no need to update the advertisement
+            return
         self._manufacturer_data[self.LEGO_CID] = Variant("ay", message)  # type: ignore
         # Notify BlueZ of the changed manufacturer data so the advertisement is updated
         self.emit_properties_changed(
@@ -519,6 +537,12 @@ class LEAdvertisingManager:
 
         self._adv_manager = adv_manager or adapter.get_interface(self.INTERFACE_NAME)  # type: ignore
 
+        self.advertisement_paths: set[str] = set()
+        """
+        Paths of the advertisements registered through this manager.
+        May still contain advertisements that have since been released by BlueZ.
+        """
+
     async def register_advertisement(
         self, adv: LEAdvertisement, options: dict | None = None
     ):
@@ -531,7 +555,8 @@ class LEAdvertisingManager:
         :return: `None`
         """
         options = options or {}
-        return await self._adv_manager.call_register_advertisement(adv.path, options)  # type: ignore
+        await self._adv_manager.call_register_advertisement(adv.path, options)  # type: ignore
+        self.advertisement_paths.add(adv.path)
 
     @overload
     async def unregister_advertisement(self, adv: LEAdvertisement): ...
@@ -545,10 +570,11 @@ class LEAdvertisingManager:
         :param adv: The advertisement service object, or path.
         :return: `None`
         """
-        if isinstance(adv, str):
-            return await self._adv_manager.call_unregister_advertisement(adv)  # type: ignore
-        else:
-            return await self._adv_manager.call_unregister_advertisement(adv.path)  # type: ignore
+        path = adv if isinstance(adv, str) else adv.path
+        try:
+            await self._adv_manager.call_unregister_advertisement(path)  # type: ignore
+        finally:
+            self.advertisement_paths.discard(path)
 
     async def active_instances(self) -> int:
         """Number of active advertising instances."""
@@ -135,6 +135,8 @@ class BlueZBroadcaster(AbstractAsyncContextManager):
             # org.bluez.Error.AlreadyExists
             # org.bluez.Error.InvalidLength
             # org.bluez.Error.NotPermitted
+            # don't leave the advertisement behind on a shared bus
+            self.bus.unexport(adv.path)
             raise
 
         self.advertisements[adv.path] = adv
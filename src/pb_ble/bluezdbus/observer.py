@@ -2,6 +2,7 @@
 This module contains a Pybricks-specific implementation of the BLE "Observer" role.
 """
 
+import asyncio
 import logging
 from contextlib import AbstractAsyncContextManager
 from struct import pack
@@ -20,7 +21,7 @@ from ..constants import (
     PybricksBroadcastData,
     ScanningMode,
 )
-from ..messages import decode_message
+from ..messages import _decode_message
 
 log = logging.getLogger(name=__name__)
 
@@ -81,12 +82,19 @@ class BlueZPybricksObserver(AbstractAsyncContextManager):
         for channel in self.channels:
             if (
                 not isinstance(channel, int)
-                or PYBRICKS_MIN_CHANNEL < channel > PYBRICKS_MAX_CHANNEL
+                or not PYBRICKS_MIN_CHANNEL <= channel <= PYBRICKS_MAX_CHANNEL
             ):
                 raise ValueError(
                     f"Observe channel must be list of integers from {PYBRICKS_MIN_CHANNEL} to {PYBRICKS_MAX_CHANNEL}."
                 )
 
+        # Lookup table of observed channels, or None to observe all channels
+        self._channel_filter: bytearray | None = None
+        if self.channels:
+            self._channel_filter = bytearray(PYBRICKS_MAX_CHANNEL + 1)
+            for channel in self.channels:
+                self._channel_filter[channel] = 1
+
         self.rssi_threshold = rssi_threshold
         """The configured RSSI threshold for broadcasts."""
         self.device_pattern = device_pattern
@@ -96,6 +104,9 @@ class BlueZPybricksObserver(AbstractAsyncContextManager):
         )
         """Cache of observed broadcasts."""
 
+        # Pending waiters for the next broadcast, keyed by channel
+        self._waiters: dict[int, asyncio.Future[ObservedAdvertisement]] = {}
+
         # Filters used for active scanning
         filters: BlueZDiscoveryFilters = BlueZDiscoveryFilters()
 
@@ -176,23 +187,31 @@ class BlueZPybricksObserver(AbstractAsyncContextManager):
             return
 
         if LEGO_CID not in ad.manufacturer_data:
-            log.debug(
-                "Filtered AD due to invalid manufacturer data: %s",
-                ad.manufacturer_data.keys(),
-            )
+            # Most advertisements are not from Pybricks, so only describe
+            # them when debug logging is enabled.
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    "Filtered AD due to invalid manufacturer data: %s",
+                    list(ad.manufacturer_data.keys()),
+                )
             return
 
         message = ad.manufacturer_data[LEGO_CID]
-        channel, data = decode_message(message)
+        channel, data = _decode_message(message)
 
-        if self.channels and channel not in self.channels:
+        if self._channel_filter is not None and not self._channel_filter[channel]:
             log.debug("Filtered broadcast due to wrong channel: %i", channel)
             return
 
         log.info(
             "Pybricks broadcast on channel %i: %s (rssi %s)", channel, data, ad.rssi
         )
-        self.advertisements[channel] = ObservedAdvertisement(data, ad.rssi)
+        advertisement = ObservedAdvertisement(data, ad.rssi)
+        self.advertisements[channel] = advertisement
+
+        if self._waiters and (waiter := self._waiters.pop(channel, None)):
+            if not waiter.done():
+                waiter.set_result(advertisement)
 
     def observe(self, channel: int) -> ObservedAdvertisement | None:
         """
@@ -207,10 +226,41 @@ class BlueZPybricksObserver(AbstractAsyncContextManager):
 
         return self.advertisements.get(channel, None)
 
+    async def wait(self, channel: int) -> ObservedAdvertisement:
+        """
+        Waits for the next broadcast on a given channel.
+
+        :param channel: The channel to observe (0 to 255).
+        :return: The received data and its signal strength.
+        :raises asyncio.CancelledError: If the observer is stopped while waiting.
+        """
+        if self.channels and channel not in self.channels:
+            raise ValueError(f"Channel {channel} not allocated.")
+
+        waiter = self._waiters.get(channel)
+        if waiter is None:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters[channel] = waiter
+
+        # Shield the shared future, so that a cancelled waiter does not
+        # cancel the other waiters on the same channel
+        return await asyncio.shield(waiter)
+
+    def clear(self) -> None:
+        """
+        Discards all observed data, without stopping the scanner.
+        """
+        self.advertisements.clear()
+
     async def __aenter__(self):
         log.info("Observing on channels %s...", self.channels or "ALL")
         await self._scanner.start()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
+        # Nothing will be received anymore, so release all pending waits
+        for waiter in self._waiters.values():
+            waiter.cancel()
+        self._waiters.clear()
+
         await self._scanner.stop()
@@ -78,10 +78,15 @@ options:
 [bluez-experimental]:https://wiki.archlinux.org/title/Bluetooth#Enabling_experimental_features
 """
 
+import asyncio
 import datetime
 import logging
+import signal
 import sys
 
+_STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+"""The signals that shut down the CLI tools."""
+
 
 def setup_cli_logging():
     """Configure logging for the CLI tools."""
@@ -101,4 +106,38 @@ def setup_cli_logging():
     )
 
 
+def add_stop_signal_handlers(stop: asyncio.Future[None]) -> None:
+    """
+    Completes the given stop future when the process receives SIGINT
+    (Ctrl-C) or SIGTERM, so the CLI tools can shut down cleanly.
+
+    Should be called once setup is complete, as the stop future is not
+    awaited before that. The handlers are removed on the first signal, so
+    that a second signal interrupts a hanging shutdown.
+
+    :param stop: The stop future.
+    """
+    if stop.done():
+        return
+
+    loop = stop.get_loop()
+    for sig in _STOP_SIGNALS:
+        loop.add_signal_handler(sig, set_stop_future, stop)
+
+
+def set_stop_future(stop: asyncio.Future[None]) -> None:
+    """
+    Completes the given stop future, unless it is already done, and removes
+    the stop signal handlers.
+
+    :param stop: The stop future.
+    """
+    loop = stop.get_loop()
+    for sig in _STOP_SIGNALS:
+        loop.remove_signal_handler(sig)
+
+    if not stop.done():
+        stop.set_result(None)
+
+
 __all__ = ()
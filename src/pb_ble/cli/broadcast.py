@@ -17,44 +17,52 @@ from pb_ble.bluezdbus import (
     get_adapter,
 )
 
-from . import setup_cli_logging
-
-parser = argparse.ArgumentParser(
-    prog="pb_broadcast",
-    description="Send Pybricks BLE broadcasts",
-    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+from . import (
+    add_stop_signal_handlers,
+    set_stop_future,
+    setup_cli_logging,
 )
 
-parser.add_argument(
-    "data",
-    nargs="+",
-    type=json.loads,
-    help="Data to broadcast: channel followed by JSON values",
-)
 
-parser.add_argument(
-    "--adapter", required=False, default="hci0", help="Bluetooth adapter name"
-)
-# recommended to be 10 bytes or less
-parser.add_argument(
-    "--name",
-    required=False,
-    default="pb_vhub",  # TODO: Must be valid DBus path segment
-    help="Bluetooth device name to use for advertisements",
-)
-parser.add_argument(
-    "--timeout",
-    required=False,
-    type=int,
-    default=10,
-    help="Broadcast timeout in seconds",
-)
-parser.add_argument(
-    "--debug",
-    required=False,
-    action="store_true",
-    help="Enable debug logging",
-)
+def _build_parser() -> argparse.ArgumentParser:
+    """Builds the argument parser. Only needed when running as CLI."""
+    parser = argparse.ArgumentParser(
+        prog="pb_broadcast",
+        description="Send Pybricks BLE broadcasts",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "data",
+        nargs="+",
+        type=json.loads,
+        help="Data to broadcast: channel followed by JSON values",
+    )
+
+    parser.add_argument(
+        "--adapter", required=False, default="hci0", help="Bluetooth adapter name"
+    )
+    # recommended to be 10 bytes or less
+    parser.add_argument(
+        "--name",
+        required=False,
+        default="pb_vhub",  # TODO: Must be valid DBus path segment
+        help="Bluetooth device name to use for advertisements",
+    )
+    parser.add_argument(
+        "--timeout",
+        required=False,
+        type=int,
+        default=10,
+        help="Broadcast timeout in seconds",
+    )
+    parser.add_argument(
+        "--debug",
+        required=False,
+        action="store_true",
+        help="Enable debug logging",
+    )
+    return parser
 
 
 async def broadcast(
@@ -73,24 +81,25 @@ async def broadcast(
     :param channel: Pybricks channel to broadcast on.
     :param data: The data to broadcast.
     """
-    stop_event = asyncio.Event()
+    stop: asyncio.Future[None] = asyncio.get_running_loop().create_future()
 
     bus: MessageBus = await MessageBus(bus_type=BusType.SYSTEM).connect()
     adapter: ProxyObject = await get_adapter(bus, adapter_name)
 
     adv = PybricksBroadcastAdvertisement(
-        device_name, channel, data, on_release=lambda p: stop_event.set()
+        device_name, channel, data, on_release=lambda p: set_stop_future(stop)
     )
     adv._timeout = timeout
 
     async with BlueZBroadcaster(bus, adapter, device_name) as broadcaster:
         await broadcaster.broadcast(adv)
-        await stop_event.wait()
+        add_stop_signal_handlers(stop)
+        await stop
 
 
 def main():
     setup_cli_logging()
-    args = parser.parse_args()
+    args = _build_parser().parse_args()
 
     if args.debug:
         logging.getLogger("pb_ble").setLevel(logging.DEBUG)
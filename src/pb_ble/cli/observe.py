@@ -9,45 +9,52 @@ from typing import Literal, Sequence
 
 from pb_ble.bluezdbus import BlueZPybricksObserver
 
-from . import setup_cli_logging
+from . import add_stop_signal_handlers, setup_cli_logging
 
-parser = argparse.ArgumentParser(
-    prog="pb_observe",
-    description="Observe Pybricks BLE broadcasts",
-    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-)
-parser.add_argument(
-    "channels",
-    metavar="N [0 to 255]",
-    type=int,
-    nargs="*",
-    help="Pybricks channels to observe, or all channels if not given.",
-)
-parser.add_argument("--adapter", required=False, help="Bluetooth adapter name")
-parser.add_argument(
-    "--rssi",
-    required=False,
-    type=int,
-    choices=range(-120, 1),
-    metavar="[-120 to 0]",
-    help="RSSI threshold",
-)
-parser.add_argument(
-    "--pattern", required=False, default="Pybricks", help="Device name pattern filter"
-)
-parser.add_argument(
-    "--mode",
-    required=False,
-    choices=["active", "passive"],
-    default="passive",
-    help="BLE scanning mode",
-)
-parser.add_argument(
-    "--debug",
-    required=False,
-    action="store_true",
-    help="Enable debug logging",
-)
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Builds the argument parser. Only needed when running as CLI."""
+    parser = argparse.ArgumentParser(
+        prog="pb_observe",
+        description="Observe Pybricks BLE broadcasts",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "channels",
+        metavar="N [0 to 255]",
+        type=int,
+        nargs="*",
+        help="Pybricks channels to observe, or all channels if not given.",
+    )
+    parser.add_argument("--adapter", required=False, help="Bluetooth adapter name")
+    parser.add_argument(
+        "--rssi",
+        required=False,
+        type=int,
+        choices=range(-120, 1),
+        metavar="[-120 to 0]",
+        help="RSSI threshold",
+    )
+    parser.add_argument(
+        "--pattern",
+        required=False,
+        default="Pybricks",
+        help="Device name pattern filter",
+    )
+    parser.add_argument(
+        "--mode",
+        required=False,
+        choices=["active", "passive"],
+        default="passive",
+        help="BLE scanning mode",
+    )
+    parser.add_argument(
+        "--debug",
+        required=False,
+        action="store_true",
+        help="Enable debug logging",
+    )
+    return parser
 
 
 async def observe(
@@ -66,7 +73,7 @@ async def observe(
     :param rssi_threshold: Minimum required signal strength in dBm.
     :param device_pattern: Device name pattern filter.
     """
-    stop_event = asyncio.Event()
+    stop: asyncio.Future[None] = asyncio.get_running_loop().create_future()
     async with BlueZPybricksObserver(
         adapter_name=adapter_name,
         scanning_mode=scanning_mode,
@@ -74,12 +81,13 @@ async def observe(
         rssi_threshold=rssi_threshold,
         device_pattern=device_pattern,
     ):
-        await stop_event.wait()
+        add_stop_signal_handlers(stop)
+        await stop
 
 
 def main():
     setup_cli_logging()
-    args = parser.parse_args()
+    args = _build_parser().parse_args()
 
     if args.debug:
         logging.getLogger("pb_ble").setLevel(logging.DEBUG)
@@ -11,10 +11,14 @@ Based on:
 """
 
 from enum import IntEnum
-from struct import pack, unpack, unpack_from
-from typing import Literal, Tuple
+from struct import Struct
+from typing import Any, Callable, Iterable, Literal, Tuple
 
-from .constants import PybricksBroadcast, PybricksBroadcastValue
+from .constants import (
+    PybricksBroadcast,
+    PybricksBroadcastData,
+    PybricksBroadcastValue,
+)
 
 
 def decode_message(
@@ -29,25 +33,71 @@ def decode_message(
         original value. The original value is either a single object
         or a tuple.
     """
+    channel, value = _decode_message(data)
+    return PybricksBroadcast(channel, value)
+
+
+def _decode_message(
+    data: bytes,
+) -> tuple[int, PybricksBroadcastData]:
+    """
+    Parses a Pybricks broadcast message into a plain tuple.
+
+    Same as `decode_message()`, but skips constructing the named tuple
+    for internal callers that unpack the result right away.
+
+    :param data: The encoded data.
+    :return: Tuple containing the Pybricks message channel and the
+        original value.
+    """
 
     # idx 0 is the channel
-    channel: int = unpack_from("<B", data)[0]  # uint8
+    channel: int = data[0]  # uint8
+    size = len(data)
+    decode_next_value = _decode_next_value
+
+    # fast path for the common case of a single object
+    if size > 2 and data[1] == _SINGLE_OBJECT_MARKER:
+        idx, val = decode_next_value(2, data)
+        if idx == size and val is not None:
+            return channel, val
+
     # idx 1 is the message start
     idx = 1
-    decoded_data = []
+    decoded_data: list[PybricksBroadcastValue] = []
+    append_value = decoded_data.append
     single_object = False
 
-    while idx < len(data):
-        idx, val = _decode_next_value(idx, data)
+    while idx < size:
+        idx, val = decode_next_value(idx, data)
         if val is None:
             single_object = True
         else:
-            decoded_data.append(val)
+            append_value(val)
 
     if single_object:
-        return PybricksBroadcast(channel, decoded_data[0])
+        return channel, decoded_data[0]
     else:
-        return PybricksBroadcast(channel, tuple(decoded_data))  # type: ignore # https://github.com/python/mypy/issues/7509
+        return channel, tuple(decoded_data)  # type: ignore # https://github.com/python/mypy/issues/7509
+
+
+def decode_messages(
+    messages: Iterable[bytes],
+) -> list[PybricksBroadcast]:
+    """
+    Parses a batch of Pybricks broadcast messages.
+
+    Equivalent to calling `decode_message()` for each message, but with
+    less per-message overhead when ingesting many messages at once.
+
+    :param messages: The encoded messages.
+    :return: List of the decoded messages, in the same order.
+    """
+    # bind globals to locals for the loop
+    decode = _decode_message
+    broadcast = PybricksBroadcast
+
+    return [broadcast(*decode(data)) for data in messages]
 
 
 def encode_message(channel: int = 0, *values: PybricksBroadcastValue) -> bytes:
@@ -60,32 +110,81 @@ def encode_message(channel: int = 0, *values: PybricksBroadcastValue) -> bytes:
         message size of 27 bytes.
     :return: The encoded message.
     """
+    buf = bytearray(ENCODED_MESSAGE_MAX_SIZE)
+    size = encode_message_into(buf, channel, *values)
+    return bytes(memoryview(buf)[:size])
+
+
+def encode_message_into(
+    buf: bytearray, channel: int = 0, *values: PybricksBroadcastValue
+) -> int:
+    """
+    Encodes the given values as a Pybricks broadcast message into an existing
+    buffer, starting at index 0.
+
+    This avoids allocating a new buffer for every message, e.g. when the
+    same broadcast is updated frequently.
+
+    :param buf: The buffer to write the message to. Must have a size of at
+        least `ENCODED_MESSAGE_MAX_SIZE` bytes to fit any message.
+    :param channel: The Pybricks broadcast channel (0 to 255), defaults to 0.
+    :param values: The values to encode in the message.
+    :raises ValueError: If the buffer is too small, or the total size of the
+        message exceeds the maximum message size of 27 bytes.
+    :return: The number of bytes written to the buffer.
+    """
+
+    if len(buf) < ENCODED_MESSAGE_MAX_SIZE:
+        raise ValueError(
+            f"Buffer too small: {len(buf)} bytes (minimum is {ENCODED_MESSAGE_MAX_SIZE} bytes)"
+        )
 
     # idx 0 is the channel
-    encoded_channel = pack("<B", channel)
+    CHANNEL_STRUCT.pack_into(buf, 0, channel)
 
     # idx 1 is the message start
-    encoded_data = bytearray(encoded_channel)
+    idx = 1
 
     if len(values) == 1:
         # set SINGLE_OBJECT marker
-        header = PybricksBleBroadcastDataType.SINGLE_OBJECT << 5
-        encoded_data.append(header)
+        buf[idx] = _SINGLE_OBJECT_MARKER
+        idx += 1
 
     for val in values:
-        header, encoded_val = _encode_value(val)
-        encoded_data.append(header)
+        idx = _encode_value_into(buf, idx, val)
+
+    return idx
+
 
-        if encoded_val is not None:
-            encoded_data += encoded_val
+def _make_int_message_encoder(channel: int) -> Callable[[int], bytes]:
+    """
+    Creates an encoder for messages consisting of a single `int` value on a
+    fixed channel, which is the most common Pybricks broadcast.
+
+    The message prefix (channel, SINGLE_OBJECT marker and header) only
+    depends on the integer size, so it is precomputed once per size.
+
+    :param channel: The Pybricks broadcast channel (0 to 255).
+    :return: Function encoding an `int` value into a complete message,
+        equivalent to ``encode_message(channel, val)``.
+    """
+    # indexed by the number of bits required excluding the sign bit
+    table = tuple(
+        (
+            bytes((channel, _SINGLE_OBJECT_MARKER, _HEADER_INT | size)),
+            INT_STRUCT[size].pack,
+        )
+        for size in INT_SIZE_BY_BITS
+    )
 
-        # max size is 27 bytes: 26 byte payload + 1 byte channel
-        if len(encoded_data) > OBSERVED_DATA_MAX_SIZE + 1:
-            raise ValueError(
-                f"Payload too large: {len(encoded_data)} bytes (maximum is {OBSERVED_DATA_MAX_SIZE} bytes)"
-            )
+    def encode_int_message(val: int) -> bytes:
+        try:
+            prefix, pack = table[(val if val >= 0 else ~val).bit_length()]
+        except IndexError:
+            raise ValueError(f"Integer out of range: {val}") from None
+        return prefix + pack(val)
 
-    return bytes(encoded_data)
+    return encode_int_message
 
 
 def unpack_pnp_id(data: bytes) -> Tuple[Literal["BT", "USB"], int, int, int]:
@@ -99,7 +198,7 @@ def unpack_pnp_id(data: bytes) -> Tuple[Literal["BT", "USB"], int, int, int]:
     :return: Tuple containing the vendor ID type (`BT` or `USB`), the vendor
         ID, the product ID and the product revision.
     """
-    vid_type, vid, pid, rev = unpack("<BHHH", data)
+    vid_type, vid, pid, rev = PNP_ID_STRUCT.unpack(data)
     vid_type = "BT" if vid_type else "USB"
     return vid_type, vid, pid, rev
 
@@ -120,8 +219,8 @@ def pack_pnp_id(
     :return: The encoded PnP ID.
     """
 
-    pnp_id = pack(
-        "<BHHH", 1 if vendor_id_type == "BT" else 0, vendor_id, product_id, product_rev
+    pnp_id = PNP_ID_STRUCT.pack(
+        1 if vendor_id_type == "BT" else 0, vendor_id, product_id, product_rev
     )
     return pnp_id
 
@@ -140,11 +239,32 @@ INT_FORMAT = {
 }
 """Mapping of integer types to struct format."""
 
+INT_SIZE_BY_BITS = bytes(
+    [SIZEOF_INT8_T] * 8 + [SIZEOF_INT16_T] * 8 + [SIZEOF_INT32_T] * 16
+)
+"""Mapping of the number of bits of an integer (excluding the sign bit) to
+the smallest integer type that fits it."""
+
+INT_STRUCT = {size: Struct(format) for size, format in INT_FORMAT.items()}
+"""Mapping of integer types to precompiled struct."""
+
+FLOAT_STRUCT = Struct("<f")
+"""Precompiled struct for float32 values."""
+
 OBSERVED_DATA_MAX_SIZE = 31 - 5
 """Maximum size of the observed data included in the BLE advertising packet:
 31 (max adv data size) - 5 (overhead).
 """
 
+ENCODED_MESSAGE_MAX_SIZE = OBSERVED_DATA_MAX_SIZE + 1
+"""Maximum size of an encoded message: 1 byte channel + observed data."""
+
+CHANNEL_STRUCT = Struct("<B")
+"""Precompiled struct for the channel (uint8)."""
+
+PNP_ID_STRUCT = Struct("<BHHH")
+"""Precompiled struct for the PnP ID characteristic."""
+
 
 class PybricksBleBroadcastDataType(IntEnum):
     """Type codes used for encoding/decoding data."""
@@ -174,6 +294,111 @@ class PybricksBleBroadcastDataType(IntEnum):
     """The Python @c bytes type."""
 
 
+# Plain int mirrors of the type codes for use in the encoder/decoder hot paths
+_T_SINGLE_OBJECT = int(PybricksBleBroadcastDataType.SINGLE_OBJECT)
+_T_TRUE = int(PybricksBleBroadcastDataType.TRUE)
+_T_FALSE = int(PybricksBleBroadcastDataType.FALSE)
+_T_INT = int(PybricksBleBroadcastDataType.INT)
+_T_FLOAT = int(PybricksBleBroadcastDataType.FLOAT)
+_T_STR = int(PybricksBleBroadcastDataType.STR)
+_T_BYTES = int(PybricksBleBroadcastDataType.BYTES)
+
+_SINGLE_OBJECT_MARKER = _T_SINGLE_OBJECT << 5
+"""Header byte of the SINGLE_OBJECT marker."""
+
+# Precomputed header bytes, the size is OR-ed in for variable sized types
+_HEADER_TRUE = _T_TRUE << 5
+_HEADER_FALSE = _T_FALSE << 5
+_HEADER_INT = _T_INT << 5
+_HEADER_FLOAT = (_T_FLOAT << 5) | 4
+_HEADER_STR = _T_STR << 5
+_HEADER_BYTES = _T_BYTES << 5
+
+
+def _build_valid_headers() -> bytearray:
+    """
+    Builds a lookup table of valid header bytes, i.e. all supported
+    combinations of data type and size.
+    """
+    valid_headers = bytearray(256)
+    for type_id, sizes in (
+        (_T_SINGLE_OBJECT, (0,)),
+        (_T_TRUE, (0,)),
+        (_T_FALSE, (0,)),
+        (_T_INT, INT_FORMAT.keys()),
+        (_T_FLOAT, (4,)),
+        (_T_STR, range(0x20)),
+        (_T_BYTES, range(0x20)),
+    ):
+        for size in sizes:
+            valid_headers[(type_id << 5) | size] = 1
+    return valid_headers
+
+
+_VALID_HEADERS = _build_valid_headers()
+"""Lookup table of valid header bytes, indexed by header byte."""
+
+_STR_CACHE: dict[bytes, str] = {}
+"""Cache of decoded short strings."""
+_STR_CACHE_MAX_LEN = 16
+"""Maximum length in bytes of strings to cache."""
+_STR_CACHE_MAX_SIZE = 1024
+"""Maximum number of cached strings."""
+
+
+def _decode_true(idx: int, size: int, data: bytes) -> tuple[int, bool]:
+    """Decodes a `True` value, which is fully described by its header byte."""
+    return idx, True
+
+
+def _decode_false(idx: int, size: int, data: bytes) -> tuple[int, bool]:
+    """Decodes a `False` value, which is fully described by its header byte."""
+    return idx, False
+
+
+def _decode_int(idx: int, size: int, data: bytes) -> tuple[int, int]:
+    """Decodes an int8, int16 or int32 value."""
+    return idx + size, INT_STRUCT[size].unpack_from(data, idx)[0]
+
+
+def _decode_float(idx: int, size: int, data: bytes) -> tuple[int, float]:
+    """Decodes a float32 value."""
+    return idx + size, FLOAT_STRUCT.unpack_from(data, idx)[0]
+
+
+def _decode_str(idx: int, size: int, data: bytes) -> tuple[int, str]:
+    """Decodes a UTF-8 `str` value."""
+    val = data[idx : idx + size]
+    if size > _STR_CACHE_MAX_LEN:
+        return idx + size, bytes.decode(val)
+    # short strings are typically repeated commands, so cache them
+    decoded = _STR_CACHE.get(val)
+    if decoded is None:
+        decoded = bytes.decode(val)
+        if len(_STR_CACHE) < _STR_CACHE_MAX_SIZE:
+            _STR_CACHE[val] = decoded
+    return idx + size, decoded
+
+
+def _decode_bytes(idx: int, size: int, data: bytes) -> tuple[int, bytes]:
+    """Decodes a `bytes` value."""
+    return idx + size, data[idx : idx + size]
+
+
+_DECODERS: tuple[
+    Callable[[int, int, bytes], tuple[int, PybricksBroadcastValue]] | None, ...
+] = (
+    None,  # SINGLE_OBJECT
+    _decode_true,
+    _decode_false,
+    _decode_int,
+    _decode_float,
+    _decode_str,
+    _decode_bytes,
+)
+"""Value decoder functions, indexed by type code."""
+
+
 def _decode_next_value(
     idx: int, data: bytes
 ) -> tuple[int, None | PybricksBroadcastValue]:
@@ -182,101 +407,134 @@ def _decode_next_value(
 
     :param idx: The starting index of the next value in data.
     :param data: The raw data.
-    :raises ValueError: If the data type is unsupported.
+    :raises ValueError: If the data type is unsupported, or the size is
+        invalid for the data type.
     :return: Tuple of the next index, and the parsed data.
         The parsed data is ``None`` if this is the
         :py:attr:`PybricksBleBroadcastDataType.SINGLE_OBJECT` marker.
     """
 
     # data type and size
-    type_id = data[idx] >> 5
-    size = data[idx] & 0x1F
-    data_type = PybricksBleBroadcastDataType(type_id)
+    header = data[idx]
+    if not _VALID_HEADERS[header]:
+        raise ValueError(f"Invalid header: {header:#04x}")
+    type_id = header >> 5
     # move cursor to value
     idx += 1
 
-    # data value
-    if data_type == PybricksBleBroadcastDataType.SINGLE_OBJECT:
+    if type_id == _T_SINGLE_OBJECT:
         # Does not contain data by itself, is only used as indicator
         # that the next data is the one and only object
-        assert size == 0
         return idx, None
-    elif data_type == PybricksBleBroadcastDataType.TRUE:
-        assert size == 0
-        return idx, True
-    elif data_type == PybricksBleBroadcastDataType.FALSE:
-        assert size == 0
-        return idx, False
-    elif data_type == PybricksBleBroadcastDataType.INT:
-        # int8 / 1 byte
-        # int16 / 2 bytes
-        # int32 / 4 bytes
-        format = INT_FORMAT[size]
-        return idx + size, unpack_from(format, data, idx)[0]
-    elif data_type == PybricksBleBroadcastDataType.FLOAT:
-        # float / uint32 / 4 bytes
-        return idx + size, unpack_from("<f", data, idx)[0]
-    elif data_type == PybricksBleBroadcastDataType.STR:
-        val = data[idx : idx + size]
-        return idx + size, bytes.decode(val)
-    elif data_type == PybricksBleBroadcastDataType.BYTES:
-        val = data[idx : idx + size]
-        return idx + size, val
-    else:
-        # unsupported data type
-        raise ValueError(f"Unsupported data type: {data_type}")
 
+    return _DECODERS[type_id](idx, header & 0x1F, data)  # type: ignore[misc] # only SINGLE_OBJECT has no decoder
+
+
+def _payload_too_large(end: int) -> ValueError:
+    """
+    Creates the error raised when a message does not fit into a broadcast.
+
+    The bounds check itself is inlined in the encoders, so the common case
+    does not pay for a function call.
 
-def _encode_value(
-    val: PybricksBroadcastValue,
-) -> tuple[int, None | bytes]:
+    :param end: The size of the message including the channel.
+    :return: The error to raise.
     """
-    Encodes the given value for a Pybricks broadcast message.
+    return ValueError(
+        f"Payload too large: {end} bytes (maximum is {OBSERVED_DATA_MAX_SIZE} bytes)"
+    )
+
+
+def _encode_bool_into(buf: bytearray, idx: int, val: bool) -> int:
+    """Encodes a `bool` value, which is fully described by its header byte."""
+    end = idx + 1
+    if end > ENCODED_MESSAGE_MAX_SIZE:
+        raise _payload_too_large(end)
+    buf[idx] = _HEADER_TRUE if val else _HEADER_FALSE
+    return end
+
+
+def _encode_int_into(buf: bytearray, idx: int, val: int) -> int:
+    """Encodes an `int` value using the smallest fitting integer size."""
+    # number of bits required excluding the sign bit
+    bits = (val if val >= 0 else ~val).bit_length()
+    try:
+        size = INT_SIZE_BY_BITS[bits]
+    except IndexError:
+        raise ValueError(f"Integer out of range: {val}") from None
+    end = idx + 1 + size
+    if end > ENCODED_MESSAGE_MAX_SIZE:
+        raise _payload_too_large(end)
+    buf[idx] = _HEADER_INT | size
+    INT_STRUCT[size].pack_into(buf, idx + 1, val)
+    return end
+
+
+def _encode_float_into(buf: bytearray, idx: int, val: float) -> int:
+    """Encodes a `float` value as float32."""
+    end = idx + 5
+    if end > ENCODED_MESSAGE_MAX_SIZE:
+        raise _payload_too_large(end)
+    buf[idx] = _HEADER_FLOAT
+    FLOAT_STRUCT.pack_into(buf, idx + 1, val)
+    return end
+
+
+def _encode_str_into(buf: bytearray, idx: int, val: str) -> int:
+    """Encodes a `str` value as UTF-8."""
+    encoded_val = val.encode()
+    end = idx + 1 + len(encoded_val)
+    if end > ENCODED_MESSAGE_MAX_SIZE:
+        raise _payload_too_large(end)
+    buf[idx] = _HEADER_STR | (len(encoded_val) & 0x1F)
+    buf[idx + 1 : end] = encoded_val
+    return end
+
+
+def _encode_bytes_into(buf: bytearray, idx: int, val: bytes) -> int:
+    """Encodes a `bytes` value as-is."""
+    end = idx + 1 + len(val)
+    if end > ENCODED_MESSAGE_MAX_SIZE:
+        raise _payload_too_large(end)
+    buf[idx] = _HEADER_BYTES | (len(val) & 0x1F)
+    buf[idx + 1 : end] = val
+    return end
+
+
+_ENCODERS: dict[type, Callable[[bytearray, int, Any], int]] = {
+    bool: _encode_bool_into,
+    int: _encode_int_into,
+    float: _encode_float_into,
+    str: _encode_str_into,
+    bytes: _encode_bytes_into,
+}
+"""Mapping of supported value types to their encoder function."""
+
 
+def _encode_value_into(buf: bytearray, idx: int, val: PybricksBroadcastValue) -> int:
+    """
+    Encodes the given value for a Pybricks broadcast message, writing the
+    header byte and the encoded value into the buffer at ``idx``.
+
+    The buffer must have a size of at least `ENCODED_MESSAGE_MAX_SIZE`.
+
+    :param buf: The buffer to write to.
+    :param idx: The index to write the value to.
     :param val: The value to encode.
-    :raises ValueError: If the data type is unsupported.
-    :return: Tuple containing the header byte and the encoded value,
-        which may be None if no value is required in addition to the
-        header byte.
+    :raises ValueError: If the data type is unsupported, or the value
+        does not fit into the message.
+    :return: The index after the encoded value.
     """
 
-    size = 0
-    encoded_val = None
+    encoder = _ENCODERS.get(type(val))
 
-    if isinstance(val, bool):
-        data_type = (
-            PybricksBleBroadcastDataType.TRUE
-            if val
-            else PybricksBleBroadcastDataType.FALSE
+    if encoder is None:
+        # slow path for subclasses of supported types, e.g. IntEnum
+        encoder = next(
+            (_ENCODERS[t] for t in type(val).__mro__ if t in _ENCODERS), None
         )
-    elif isinstance(val, int):
-        data_type = PybricksBleBroadcastDataType.INT
-        if -128 <= val <= 127:
-            # int8
-            size = 1
-        elif -32768 <= val <= 32767:
-            # int16
-            size = 2
-        else:
-            # int32
-            size = 4
-        format = INT_FORMAT[size]
-        encoded_val = pack(format, val)
-    elif isinstance(val, float):
-        data_type = PybricksBleBroadcastDataType.FLOAT
-        size = 4
-        encoded_val = pack("<f", val)
-    elif isinstance(val, str):
-        data_type = PybricksBleBroadcastDataType.STR
-        size = len(val)
-        encoded_val = val.encode()
-    elif isinstance(val, bytes):
-        data_type = PybricksBleBroadcastDataType.BYTES
-        size = len(val)
-        encoded_val = val
-    else:
-        # unsupported data type
-        raise ValueError(f"Unsupported data type: {type(val)}")
+        if encoder is None:
+            # unsupported data type
+            raise ValueError(f"Unsupported data type: {type(val)}")
 
-    header = (data_type << 5) | (size & 0x1F)
-    return header, encoded_val
+    return encoder(buf, idx, val)
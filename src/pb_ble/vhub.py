@@ -1,6 +1,8 @@
+import asyncio
 import sys
 from contextlib import AsyncExitStack
-from typing import ClassVar, Optional, Sequence, Tuple, Union
+from typing import ClassVar, NamedTuple, Optional, Sequence, Tuple, Union
+from weakref import WeakKeyDictionary
 
 from dbus_fast.aio import MessageBus, ProxyObject
 from dbus_fast.constants import BusType
@@ -9,10 +11,12 @@ from pybricks.hubs import _common
 from .bluezdbus import (
     BlueZBroadcaster,
     BlueZPybricksObserver,
+    ObservedAdvertisement,
     PybricksBroadcastAdvertisement,
     get_adapter,
     get_adapter_details,
 )
+from .bluezdbus.adapters import AdapterDetailsExt
 from .constants import (
     PYBRICKS_MAX_CHANNEL,
     PYBRICKS_MIN_CHANNEL,
@@ -50,7 +54,10 @@ class VirtualBLE(_common.BLE, AsyncExitStack):
         self._broadcaster = broadcaster
         self._observer = observer
 
-        self._adv = PybricksBroadcastAdvertisement(broadcaster.name, broadcast_channel)
+        self._adv = PybricksBroadcastAdvertisement(
+            broadcaster.name, broadcast_channel, on_release=self._on_release
+        )
+        self._is_broadcasting = False
 
     async def __aenter__(self):
         try:
@@ -61,12 +68,24 @@ class VirtualBLE(_common.BLE, AsyncExitStack):
                 raise
         return self
 
+    async def __aexit__(self, *exc_details):
+        # Exiting the broadcaster context stops all broadcasts
+        self._is_broadcasting = False
+        return await super().__aexit__(*exc_details)
+
+    def _on_release(self, path: str) -> None:
+        """Called when BlueZ releases the broadcast, e.g. after a timeout."""
+        self._is_broadcasting = False
+
     async def broadcast(self, data: Union[bool, int, float, str, bytes]) -> None:
         if data is None:
-            await self._broadcaster.stop_broadcast(self._adv)
+            if self._is_broadcasting:
+                self._is_broadcasting = False
+                await self._broadcaster.stop_broadcast(self._adv)
         else:
-            if not self._broadcaster.is_broadcasting(self._adv):
+            if not self._is_broadcasting:
                 await self._broadcaster.broadcast(self._adv)
+                self._is_broadcasting = True
             self._adv.message = data
 
     def observe(
@@ -79,6 +98,31 @@ class VirtualBLE(_common.BLE, AsyncExitStack):
         advertisement = self._observer.observe(channel)
         return advertisement.rssi if advertisement is not None else -128
 
+    def observe_with_rssi(self, channel: int) -> Optional[ObservedAdvertisement]:
+        """
+        Retrieves the last observed data for a given channel together with
+        its signal strength.
+
+        This combines `observe()` and `signal_strength()` into a single lookup.
+
+        :param channel: The channel to observe (0 to 255).
+        :return: The received data and its signal strength in dBm, or `None`
+            if no recent data is available.
+        """
+        return self._observer.observe(channel)
+
+    async def wait_for_observation(self, channel: int) -> ObservedAdvertisement:
+        """
+        Waits for the next broadcast on a given channel.
+
+        Unlike `observe()`, this does not need to be polled: it returns as
+        soon as new data is received.
+
+        :param channel: The channel to observe (0 to 255).
+        :return: The received data and its signal strength in dBm.
+        """
+        return await self._observer.wait(channel)
+
     def version(self) -> str:
         return self._device_version
 
@@ -112,6 +156,9 @@ async def get_virtual_ble(
         await asyncio.sleep(10)
     ```
 
+    `VirtualBLE` objects using the same adapter share a single D-Bus
+    connection, which is closed when the last of them exits its context.
+
     :param adapter_name: The Bluetooth adapter to use, defaults to `None`
         (auto-discover default device).
     :param device_name: The name of the hub. This may be used as local name
@@ -133,27 +180,154 @@ async def get_virtual_ble(
     :return: A `VirtualBLE` object which is loosely adhering to the Pybricks Hub
         BLE interface.
     """
-    bus: MessageBus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+    shared_adapters = _get_shared_adapters()
+    shared = await shared_adapters.acquire(adapter_name)
 
-    # Find given adapter or default adapter
-    adapter_name, details = (
-        await get_adapter_details()
-        if adapter_name is None
-        else await get_adapter_details(adapter_name)
+    broadcaster = BlueZBroadcaster(
+        bus=shared.bus, adapter=shared.adapter, name=device_name
     )
-    adapter: ProxyObject = await get_adapter(bus, adapter_name)
-
-    broadcaster = BlueZBroadcaster(bus=bus, adapter=adapter, name=device_name)
     observer = BlueZPybricksObserver(
-        adapter_name=adapter_name,
+        adapter_name=shared.name,
         scanning_mode=scanning_mode,
         channels=observe_channels,
         device_pattern=device_filter,
     )
 
-    return VirtualBLE(
+    vble = VirtualBLE(
         broadcaster=broadcaster,
         observer=observer,
         broadcast_channel=broadcast_channel,
-        device_version=str(details["hw_version"]),
+        device_version=str(shared.details["hw_version"]),
     )
+    # Release the shared adapter after the broadcaster and observer are stopped
+    vble.callback(shared_adapters.release, adapter_name, shared)
+    return vble
+
+
+class _SharedAdapter(NamedTuple):
+    """A message bus connection and Bluetooth adapter shared by `VirtualBLE` objects."""
+
+    bus: MessageBus
+    name: str
+    adapter: ProxyObject
+    details: AdapterDetailsExt
+
+
+async def _connect_adapter(adapter_name: str | None) -> _SharedAdapter:
+    """
+    Connects to the system message bus and looks up the given adapter.
+
+    :param adapter_name: The Bluetooth adapter to use, or `None` for the
+        default adapter.
+    :return: The connected message bus and adapter.
+    """
+    bus: MessageBus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+
+    try:
+        # Find given adapter or default adapter. The adapter is introspected
+        # while its details are looked up, which are cached afterwards.
+        adapter: ProxyObject = (
+            await get_adapter(bus)
+            if adapter_name is None
+            else await get_adapter(bus, adapter_name)
+        )
+        name, details = (
+            await get_adapter_details(bus=bus)
+            if adapter_name is None
+            else await get_adapter_details(adapter_name, bus)
+        )
+    except BaseException:
+        bus.disconnect()
+        raise
+
+    return _SharedAdapter(bus, name, adapter, details)
+
+
+class _SharedAdapters:
+    """
+    Pool of message bus connections and adapters of one event loop, shared
+    by all `VirtualBLE` objects using the same adapter.
+
+    Connections are reference counted and disconnected when the last
+    `VirtualBLE` object using them is closed.
+    """
+
+    def __init__(self):
+        self._connections: dict[str | None, asyncio.Task[_SharedAdapter]] = {}
+        """Pending or established connections, keyed by requested adapter name."""
+        self._refs: dict[int, int] = {}
+        """Reference counts, keyed by message bus object ID."""
+
+    async def acquire(self, adapter_name: str | None) -> _SharedAdapter:
+        """
+        Returns the shared connection for the given adapter, connecting to
+        it if required. Concurrent callers wait for the same connection.
+
+        :param adapter_name: The Bluetooth adapter to use, or `None` for the
+            default adapter.
+        :return: The shared connection.
+        """
+        connection = self._connections.get(adapter_name)
+
+        if connection is not None and connection.done():
+            if connection.cancelled() or connection.exception() is not None:
+                connection = None
+            elif not connection.result().bus.connected:
+                connection = None
+
+        if connection is None:
+            connection = asyncio.ensure_future(_connect_adapter(adapter_name))
+            self._connections[adapter_name] = connection
+
+        try:
+            shared = await connection
+        except BaseException:
+            if self._connections.get(adapter_name) is connection:
+                del self._connections[adapter_name]
+            raise
+
+        key = id(shared.bus)
+        self._refs[key] = self._refs.get(key, 0) + 1
+        return shared
+
+    def release(self, adapter_name: str | None, shared: _SharedAdapter) -> None:
+        """
+        Releases a shared connection obtained from `acquire()`. Disconnects
+        the message bus when it is no longer used.
+
+        :param adapter_name: The adapter name passed to `acquire()`.
+        :param shared: The shared connection.
+        """
+        key = id(shared.bus)
+        refs = self._refs[key] - 1
+
+        if refs > 0:
+            self._refs[key] = refs
+            return
+
+        del self._refs[key]
+        connection = self._connections.get(adapter_name)
+        if (
+            connection is not None
+            and connection.done()
+            and not connection.cancelled()
+            and connection.exception() is None
+            and connection.result() is shared
+        ):
+            del self._connections[adapter_name]
+        shared.bus.disconnect()
+
+
+_shared_adapters: "WeakKeyDictionary[asyncio.AbstractEventLoop, _SharedAdapters]" = (
+    WeakKeyDictionary()
+)
+"""Shared connections of each event loop."""
+
+
+def _get_shared_adapters() -> _SharedAdapters:
+    """Returns the pool of shared connections of the running event loop."""
+    loop = asyncio.get_running_loop()
+    shared_adapters = _shared_adapters.get(loop)
+    if shared_adapters is None:
+        shared_adapters = _shared_adapters[loop] = _SharedAdapters()
+    return shared_adapters
@@ -1,5 +1,8 @@
 import os
 
+import pytest
+from pytest_asyncio import is_async_test
+
 # TODO use pytest.options?
 is_bluez_mock = not os.environ.get("DISABLE_BLUEZ_MOCK", False)
 
@@ -10,6 +13,12 @@ pytest_plugins = [
 
 if is_bluez_mock:
     pytest_plugins += ["dbusmock.pytest_fixtures", "tests.fixtures.bluez5_mock"]
+else:
+
+    @pytest.fixture(scope="session")
+    def system_bus_mock() -> None:
+        # Use the real system bus
+        return None
 
 
 def pytest_configure(config) -> None:
@@ -17,3 +26,16 @@ def pytest_configure(config) -> None:
         "markers",
         "skip_on_bluez_mock(reason): Skip test on BlueZ mock",
     )
+    config.addinivalue_line(
+        "markers",
+        "bluez: Test requires the BlueZ service (mocked or real)",
+    )
+
+
+def pytest_collection_modifyitems(items) -> None:
+    # Run all async tests in the session event loop, so that session-scoped
+    # fixtures such as the D-Bus connection can be shared between tests
+    session_scope_marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
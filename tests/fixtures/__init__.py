@@ -1,5 +1,6 @@
-from typing import Generator, TypeVar
+from typing import AsyncGenerator, Generator, TypeVar
 
 T = TypeVar("T")
 
 YieldFixture = Generator[T, None, None]
+AsyncYieldFixture = AsyncGenerator[T, None]
@@ -4,6 +4,8 @@ from dbus_fast.constants import BusType
 
 from pb_ble.bluezdbus import get_adapter, get_adapter_details
 
+from . import AsyncYieldFixture
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -14,24 +16,31 @@ def pytest_addoption(parser):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def adapter_name(pytestconfig) -> str:
     return pytestconfig.getoption("adapter")
 
 
-@pytest.fixture
-async def message_bus() -> MessageBus:
+@pytest.fixture(scope="session")
+async def message_bus(system_bus_mock) -> AsyncYieldFixture[MessageBus]:
+    # Depends on the private system bus, if mocked, so that it is running
+    # before connecting
     bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
     # await bus.request_name("pb_ble.tests")
-    return bus
+    yield bus
+    bus.disconnect()
 
 
 @pytest.fixture
 async def adapter(message_bus: MessageBus, adapter_name: str) -> ProxyObject:
+    # Passing the bus caches the proxy between tests, until BlueZ signals
+    # an adapter change
     return await get_adapter(message_bus, adapter_name)
 
 
 @pytest.fixture
-async def adapter_details(adapter_name: str):
-    _, details = await get_adapter_details(adapter_name)
+async def adapter_details(message_bus: MessageBus, adapter_name: str):
+    # Passing the bus caches the details between tests, until BlueZ signals
+    # an adapter change
+    _, details = await get_adapter_details(adapter_name, message_bus)
     return details
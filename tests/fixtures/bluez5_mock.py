@@ -18,14 +18,19 @@ def pytest_runtest_setup(item) -> None:
         )
 
 
+@pytest.fixture(scope="session")
+def system_bus_mock(dbusmock_system: PrivateDBus) -> PrivateDBus:
+    return dbusmock_system
+
+
 @pytest.fixture
-def bluez_mock(dbusmock_system: PrivateDBus) -> YieldFixture[dbus.proxies.ProxyObject]:
+def bluez_mock(system_bus_mock: PrivateDBus) -> YieldFixture[dbus.proxies.ProxyObject]:
     template = "bluez5"
     parameters = {
         "advertise": True,
         "passive_scan": True,
     }
-    bustype = dbusmock_system.bustype
+    bustype = system_bus_mock.bustype
     server = SpawnedMock.spawn_with_template(
         template, parameters, bustype, stdout=sys.stdout, stderr=sys.stderr
     )
@@ -34,9 +39,13 @@ def bluez_mock(dbusmock_system: PrivateDBus) -> YieldFixture[dbus.proxies.ProxyO
 
 
 @pytest.fixture(autouse=True)
-def adapter_mock(
-    bluez_mock: dbus.proxies.ProxyObject, adapter_name: str
-) -> YieldFixture[str]:
+def adapter_mock(request, adapter_name: str) -> YieldFixture[str | None]:
+    if request.node.get_closest_marker("bluez") is None:
+        # Only spawn the BlueZ mock for tests that interact with BlueZ
+        yield None
+        return
+
+    bluez_mock: dbus.proxies.ProxyObject = request.getfixturevalue("bluez_mock")
     device_name = adapter_name
 
     # Mock out the DBus adapter
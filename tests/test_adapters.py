@@ -1,7 +1,13 @@
 import pytest
-from dbus_fast.aio import ProxyObject
+from dbus_fast import Message, MessageType
+from dbus_fast.aio import MessageBus, ProxyObject
+from dbus_fast.constants import BusType
 
-from pb_ble.bluezdbus import get_adapter
+from pb_ble.bluezdbus import get_adapter, get_adapter_details
+
+from .conftest import is_bluez_mock
+
+pytestmark = pytest.mark.bluez
 
 
 async def test_get_default_adapter(message_bus, adapter_name):
@@ -22,3 +28,73 @@ async def test_get_adapter_by_name(message_bus, adapter_name):
 async def test_get_adapter_unavailable(message_bus):
     with pytest.raises(ValueError):
         await get_adapter(message_bus, "non-existent")
+
+
+async def test_get_adapter_details_cached(message_bus, adapter_name):
+    _, details = await get_adapter_details(adapter_name, message_bus)
+    _, cached_details = await get_adapter_details(adapter_name, message_bus)
+    assert cached_details is details
+
+
+async def test_get_adapter_cached(message_bus, adapter_name):
+    adapter = await get_adapter(message_bus, adapter_name)
+    cached_adapter = await get_adapter(message_bus, adapter_name)
+    assert cached_adapter is adapter
+
+
+@pytest.mark.skipif(not is_bluez_mock, reason="Requires the BlueZ mock")
+async def test_get_adapter_removed(message_bus, adapter_name):
+    await get_adapter(message_bus, adapter_name)
+
+    # Remove the adapter over the same bus, so that the InterfacesRemoved
+    # signal is dispatched before the reply
+    reply = await message_bus.call(
+        Message(
+            destination="org.bluez",
+            path="/org/bluez",
+            interface="org.bluez.Mock",
+            member="RemoveAdapter",
+            signature="s",
+            body=[adapter_name],
+        )
+    )
+    assert reply.message_type == MessageType.METHOD_RETURN
+
+    with pytest.raises(ValueError):
+        await get_adapter(message_bus, adapter_name)
+
+
+async def test_get_adapter_details_not_cached_when_invalidated(
+    message_bus, adapter_name, monkeypatch
+):
+    from pb_ble.bluezdbus import adapters
+
+    await get_adapter_details(adapter_name, message_bus)
+    cache = await adapters._watch_adapters(message_bus)
+    cache.invalidate()
+    refresh = adapters.adapters.refresh
+
+    async def refresh_and_invalidate():
+        await refresh()
+        cache.invalidate()
+
+    monkeypatch.setattr(adapters.adapters, "refresh", refresh_and_invalidate)
+    await get_adapter_details(adapter_name, message_bus)
+    assert cache.details is None
+
+
+async def test_watch_adapters_once_per_bus(message_bus):
+    from pb_ble.bluezdbus import adapters
+
+    other_bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+    try:
+        cache = await adapters._watch_adapters(message_bus)
+        other_cache = await adapters._watch_adapters(other_bus)
+        assert other_cache is not cache
+
+        # Switching back to a bus neither resubscribes nor invalidates it
+        generation = cache.generation
+        assert await adapters._watch_adapters(message_bus) is cache
+        assert cache.generation == generation
+    finally:
+        other_bus.disconnect()
@@ -1,20 +1,37 @@
+import asyncio
+import unittest.mock
+
 import pytest
 import pytest_asyncio
 from dbus_fast.errors import DBusError
 
-from pb_ble.bluezdbus import LEAdvertisement, LEAdvertisingManager
+from pb_ble.bluezdbus import (
+    LEAdvertisement,
+    LEAdvertisingManager,
+    PybricksBroadcastAdvertisement,
+)
 from pb_ble.bluezdbus.advertisement import Include, Type
 
+# Advertisement names and indices with their expected object paths
+ADVERTISEMENT_PATH_CASES = [
+    ("test", 0, "/org/bluez/test/advertisement000"),
+    ("test", 100, "/org/bluez/test/advertisement100"),
+    ("test", 1000, "/org/bluez/test/advertisement1000"),
+]
+
+# Advertising manager properties with their expected types
+ADV_MANAGER_PROPERTIES = [
+    ("active_instances", int),
+    ("supported_instances", int),
+    ("supported_includes", list),
+    ("supported_secondary_channels", list),
+    ("supported_capabilities", dict),
+    ("supported_features", list),
+]
+
 
 class TestLEAdvertising:
-    @pytest.mark.parametrize(
-        "name,index,path",
-        [
-            ("test", 0, "/org/bluez/test/advertisement000"),
-            ("test", 100, "/org/bluez/test/advertisement100"),
-            ("test", 1000, "/org/bluez/test/advertisement1000"),
-        ],
-    )
+    @pytest.mark.parametrize("name,index,path", ADVERTISEMENT_PATH_CASES)
     def test_advertisement_path(self, name, index, path):
         adv = LEAdvertisement(
             advertising_type=Type.BROADCAST, local_name=name, index=index
@@ -37,9 +54,27 @@ class TestLEAdvertising:
         assert set(adv._includes) == {"tx-power", "local-name"}
 
 
+class TestPybricksBroadcastAdvertisement:
+    def test_message(self):
+        adv = PybricksBroadcastAdvertisement("test", channel=1, data=(42, "NTF"))
+        assert adv.message == (42, "NTF")
+
+    def test_message_unchanged(self):
+        adv = PybricksBroadcastAdvertisement("test", channel=1)
+
+        with unittest.mock.patch.object(adv, "emit_properties_changed") as emit:
+            adv.message = 42
+            adv.message = 42
+            adv.message = 24
+
+        assert emit.call_count == 2
+        assert adv.message == 24
+
+
+@pytest.mark.bluez
 class TestLEAdvertisingManager:
-    @pytest_asyncio.fixture(autouse=True)
-    async def require_advertise(self, adapter_details, adapter_name):
+    @pytest.fixture(autouse=True)
+    def require_advertise(self, adapter_details, adapter_name):
         if not adapter_details["advertise"]:
             pytest.skip(
                 reason=f"Bluetooth adapter '{adapter_name}' does not support BLE advertising"
@@ -53,27 +88,32 @@ class TestLEAdvertisingManager:
     async def adv(self, adv_manager):
         adv = LEAdvertisement(advertising_type=Type.BROADCAST, local_name="myadv")
         yield adv
-        try:
-            await adv_manager.unregister_advertisement(adv)
-        except DBusError:
-            pass
+        # Skip the D-Bus call if the test unregistered the advertisement already
+        if adv.path in adv_manager.advertisement_paths:
+            try:
+                await adv_manager.unregister_advertisement(adv)
+            except DBusError:
+                pass
 
     async def test_create(self, adapter):
         adv_manager = LEAdvertisingManager(adapter)
 
-        assert isinstance(await adv_manager.active_instances(), int)
-        assert isinstance(await adv_manager.supported_instances(), int)
-        assert isinstance(await adv_manager.supported_includes(), list)
-        assert isinstance(await adv_manager.supported_secondary_channels(), list)
-        assert isinstance(await adv_manager.supported_capabilities(), dict)
-        assert isinstance(await adv_manager.supported_features(), list)
+        # Properties are independent, so query them concurrently
+        values = await asyncio.gather(
+            *(getattr(adv_manager, name)() for name, _ in ADV_MANAGER_PROPERTIES)
+        )
+
+        for (name, expected_type), value in zip(ADV_MANAGER_PROPERTIES, values):
+            assert isinstance(value, expected_type), name
 
     async def test_register_advertisement(self, adv_manager, adv):
         await adv_manager.register_advertisement(adv)
+        assert adv.path in adv_manager.advertisement_paths
 
     async def test_unregister_advertisement(self, adv_manager, adv):
         await adv_manager.register_advertisement(adv)
         await adv_manager.unregister_advertisement(adv)
+        assert adv.path not in adv_manager.advertisement_paths
 
     async def test_unregister_advertisement_by_path(self, adv_manager, adv):
         await adv_manager.register_advertisement(adv)
@@ -1,4 +1,5 @@
-from asyncio import Lock, Semaphore
+import asyncio
+from asyncio import Semaphore
 
 import pytest
 import pytest_asyncio
@@ -8,43 +9,49 @@ from pb_ble.bluezdbus import (
     BroadcastAdvertisement,
 )
 
-lock = Lock()
+pytestmark = pytest.mark.bluez
 
 
-@pytest_asyncio.fixture(autouse=True)
-async def require_advertise(adapter_details, adapter_name):
+@pytest.fixture(autouse=True)
+def require_advertise(adapter_details, adapter_name):
     if not adapter_details["advertise"]:
         pytest.skip(
             reason=f"Bluetooth adapter '{adapter_name}' does not support BLE advertising"
         )
 
 
+@pytest.fixture
+def broadcaster_name(request) -> str:
+    # Unique name per pytest-xdist worker, so that advertisements registered
+    # by parallel workers never share an object path
+    workerinput = getattr(request.config, "workerinput", None)
+    worker_id = workerinput["workerid"] if workerinput else "main"
+    return f"vhub_{worker_id}"
+
+
 @pytest_asyncio.fixture
-async def broadcaster(message_bus, adapter):
-    broadcaster = BlueZBroadcaster(bus=message_bus, adapter=adapter, name="vhub")
-    await lock.acquire()
+async def broadcaster(message_bus, adapter, broadcaster_name):
+    broadcaster = BlueZBroadcaster(
+        bus=message_bus, adapter=adapter, name=broadcaster_name
+    )
     yield broadcaster
     await broadcaster.stop()
-    lock.release()
-
-
-@pytest_asyncio.fixture(autouse=False)
-async def broadcast_lock():
-    await lock.acquire()
-    yield
-    lock.release()
 
 
 class TestBlueZBroadcaster:
-    def test_create_broadcaster(self, message_bus, adapter):
-        broadcaster = BlueZBroadcaster(bus=message_bus, adapter=adapter, name="vhub")
+    def test_create_broadcaster(self, message_bus, adapter, broadcaster_name):
+        broadcaster = BlueZBroadcaster(
+            bus=message_bus, adapter=adapter, name=broadcaster_name
+        )
         assert broadcaster is not None
         assert len(broadcaster.advertisements) == 0
 
-    async def test_stop_broadcaster(self, message_bus, adapter):
+    async def test_stop_broadcaster(self, message_bus, adapter, broadcaster_name):
         # GIVEN an advertisement on the bus is known to the broadcaster
-        broadcaster = BlueZBroadcaster(bus=message_bus, adapter=adapter, name="vhub")
-        adv = BroadcastAdvertisement("vhub")
+        broadcaster = BlueZBroadcaster(
+            bus=message_bus, adapter=adapter, name=broadcaster_name
+        )
+        adv = BroadcastAdvertisement(broadcaster_name)
         adv.path = "/some/path"
         message_bus.export(adv.path, adv)
         broadcaster.advertisements = {adv.path: adv}
@@ -89,8 +96,8 @@ class TestBlueZBroadcaster:
         await broadcaster.broadcast(adv)
         assert adv.path in broadcaster.advertisements
 
-        # wait for release
-        assert await semaphore.acquire()
+        # wait for release, but don't hang if BlueZ never releases it
+        assert await asyncio.wait_for(semaphore.acquire(), timeout=adv._timeout + 1)
 
         # THEN it is not in the advertisements list
         assert adv.path not in broadcaster.advertisements
@@ -1,160 +1,292 @@
+from enum import IntEnum
+
 import pytest
+from hypothesis import given, reject, strategies as st
 
 from pb_ble import LEGO_CID
-from pb_ble.messages import decode_message, encode_message, pack_pnp_id, unpack_pnp_id
-
-
-class TestPybricksBleDecodeMessage:
-    def test_decode_message_single_object(self):
+from pb_ble.messages import (
+    ENCODED_MESSAGE_MAX_SIZE,
+    OBSERVED_DATA_MAX_SIZE,
+    _make_int_message_encoder,
+    decode_message,
+    decode_messages,
+    encode_message,
+    encode_message_into,
+    pack_pnp_id,
+    unpack_pnp_id,
+)
+
+# Encoded messages with their channel and values
+MESSAGE_CASES = [
+    pytest.param(
         # channel 200
         # single object marker
         # int8: 5
-        message = b"\xc8\x00\x61\x05"
-        channel, data = decode_message(message)
-
-        assert channel == 200
-        assert not isinstance(data, tuple)
-
-        assert data == 5
-
-    # TODO: Check behaviour against reference implementation
-    def test_decode_message_single_object_tuple(self):
-        # channel 200
-        # int8: 5
-        message = b"\xc8\x61\x05"
-        channel, data = decode_message(message)
-
-        assert channel == 200
-        assert isinstance(data, tuple)
-        assert len(data) == 1
-
-        assert data[0] == 5
-
-    def test_decode_message_int8_int16_int32(self):
+        b"\xc8\x00\x61\x05",
+        200,
+        (5,),
+        id="single_object",
+    ),
+    pytest.param(
         # channel: 200
         # str: '8_16_32'
         # int8: 127
         # int16: 128
         # int16: 32_767
         # int32: 32_876
-        message = b"\xc8\xa78_16_32a\x7fb\x80\x00b\xff\x7fdl\x80\x00\x00"
-        channel, data = decode_message(message)
-
-        assert channel == 200
-        assert isinstance(data, tuple)
-        assert len(data) == 5
-
-        assert data[0] == "8_16_32"
-        assert data[1] == 127
-        assert data[2] == 128
-        assert data[3] == 32_767
-        assert data[4] == 32_876
-
-    def test_decode_message_int32_max(self):
+        b"\xc8\xa78_16_32a\x7fb\x80\x00b\xff\x7fdl\x80\x00\x00",
+        200,
+        ("8_16_32", 127, 128, 32_767, 32_876),
+        id="int8_int16_int32",
+    ),
+    pytest.param(
         # channel: 200
         # str: 'int32'
         # int32: 536_870_912
-        # int32: 1_073_741_823
-        message = b"\xc8\xa5int32d\x00\x00\x00 d\xff\xff\xff?"
-        channel, data = decode_message(message)
-
-        assert channel == 200
-        assert isinstance(data, tuple)
-        assert len(data) == 3
-
-        assert data[0] == "int32"
-        assert data[1] == 536_870_912
-        assert (
-            data[2] == 1_073_741_823
-        )  # max int32 in micropython seems to be actually int31
-
-    def test_decode_message_float(self):
+        # int32: 1_073_741_823 (max int32 in micropython seems to be actually int31)
+        b"\xc8\xa5int32d\x00\x00\x00 d\xff\xff\xff?",
+        200,
+        ("int32", 536_870_912, 1_073_741_823),
+        id="int32_max",
+    ),
+    pytest.param(
         # channel: 200
         # str: 'float'
         # float32: PI
-        message = b"\xc8\xa5float\x84\xdb\x0fI@"
-        channel, data = decode_message(message)
-
-        assert channel == 200
-        assert isinstance(data, tuple)
-        assert len(data) == 2
-
-        assert data[0] == "float"
-        assert data[1] == 3.1415927410125732  # float32 pi
-
-    def test_decode_message_str_bool(self):
+        b"\xc8\xa5float\x84\xdb\x0fI@",
+        200,
+        ("float", 3.1415927410125732),
+        id="float",
+    ),
+    pytest.param(
         # channel: 200
         # str: 'NTF'
         # bool: True
         # bool: False
-        message = b"\xc8\xa3NTF @"
-        channel, data = decode_message(message)
-
-        assert channel == 200
-        assert isinstance(data, tuple)
-        assert len(data) == 3
-
-        assert data[0] == "NTF"
-        assert data[1] is True
-        assert data[2] is False
-
-    def test_decode_message_bytes(self):
+        b"\xc8\xa3NTF @",
+        200,
+        ("NTF", True, False),
+        id="str_bool",
+    ),
+    pytest.param(
         # channel: 200
         # str: 'bytes'
         # bytes: b'\x00\xc4\x81'
-        message = b"\xc8\xa5bytes\xc3\x00\xc4\x81"
+        b"\xc8\xa5bytes\xc3\x00\xc4\x81",
+        200,
+        ("bytes", b"\x00\xc4\x81"),
+        id="bytes",
+    ),
+    pytest.param(
+        # channel: 200
+        b"\xc8",
+        200,
+        (),
+        id="empty",
+    ),
+]
+
+
+class TestPybricksBleDecodeMessage:
+    @pytest.mark.parametrize("message,channel,values", MESSAGE_CASES)
+    def test_decode_message(self, message, channel, values):
+        expected = values[0] if len(values) == 1 else values
+        decoded_channel, data = decode_message(message)
+
+        assert decoded_channel == channel
+        assert data == expected
+        # also check types, e.g. to tell bool and int apart
+        if isinstance(expected, tuple):
+            assert isinstance(data, tuple)
+            assert [type(v) for v in data] == [type(v) for v in expected]
+        else:
+            assert type(data) is type(expected)
+
+    # TODO: Check behaviour against reference implementation
+    def test_decode_message_single_object_tuple(self):
+        # channel 200
+        # int8: 5
+        message = b"\xc8\x61\x05"
         channel, data = decode_message(message)
 
         assert channel == 200
         assert isinstance(data, tuple)
-        assert len(data) == 2
+        assert len(data) == 1
 
-        assert data[0] == "bytes"
-        assert data[1] == b"\x00\xc4\x81"
+        assert data[0] == 5
 
-    def test_decode_message_empty(self):
+    def test_decode_message_str_cached(self):
         # channel: 200
-        message = b"\xc8"
-        channel, data = decode_message(message)
+        # str: 'NTF'
+        message = b"\xc8\x00\xa3NTF"
+        _, first = decode_message(message)
+        _, second = decode_message(bytes(message))
 
-        assert channel == 200
-        assert isinstance(data, tuple)
-        assert len(data) == 0
+        assert first == "NTF"
+        assert second is first
+
+    def test_decode_message_unsupported(self):
+        # channel: 200
+        # type id 7: unsupported
+        message = b"\xc8\xe0"
+        with pytest.raises(ValueError):
+            decode_message(message)
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            # bool: True with size 1
+            b"\xc8\x21",
+            # int: size 3
+            b"\xc8\x63\x00\x00\x00",
+            # float: size 2
+            b"\xc8\x82\x00\x00",
+        ],
+    )
+    def test_decode_message_invalid_size(self, message):
+        with pytest.raises(ValueError):
+            decode_message(message)
+
+
+class TestPybricksBleDecodeMessages:
+    def test_decode_messages(self):
+        messages = [
+            b"\xc8\x00\x61\x05",
+            b"\xc8\xa3NTF @",
+            b"\x01",
+        ]
+        decoded = decode_messages(messages)
+
+        assert decoded == [decode_message(message) for message in messages]
+        assert decoded[0] == (200, 5)
+        assert decoded[1] == (200, ("NTF", True, False))
+        assert decoded[2] == (1, ())
+
+    def test_decode_messages_empty(self):
+        assert decode_messages([]) == []
 
 
 class TestPybricksBleEncodeMessage:
-    def test_encode_message_single_object(self):
-        data = encode_message(200, 5)
-        assert data == b"\xc8\x00\x61\x05"
+    @pytest.mark.parametrize("message,channel,values", MESSAGE_CASES)
+    def test_encode_message(self, message, channel, values):
+        data = encode_message(channel, *values)
+        assert data == message
 
     @pytest.mark.skip("Check behaviour against reference implementation")
     def test_encode_message_single_object_tuple(self):
         data = encode_message(200, (1))
         assert data == b"\xc8\x61\x01"
 
-    def test_encode_message_int8_int16_int32(self):
-        data = encode_message(200, "8_16_32", 127, 128, 32_767, 32_876)
-        assert data == b"\xc8\xa78_16_32a\x7fb\x80\x00b\xff\x7fdl\x80\x00\x00"
-
-    def test_encode_message_int32_max(self):
-        data = encode_message(200, "int32", 536_870_912, 1_073_741_823)
-        assert data == b"\xc8\xa5int32d\x00\x00\x00 d\xff\xff\xff?"
-
-    def test_encode_message_float(self):
-        data = encode_message(0, "float", 3.1415927410125732)  # float32 pi
-        assert data == b"\x00\xa5float\x84\xdb\x0fI@"
-
-    def test_encode_message_str_bool(self):
-        data = encode_message(200, "NTF", True, False)
-        assert data == b"\xc8\xa3NTF @"
-
-    def test_encode_message_bytes(self):
-        data = encode_message(200, "bytes", b"\x00\xc4\x81")
-        assert data == b"\xc8\xa5bytes\xc3\x00\xc4\x81"
+    @pytest.mark.parametrize(
+        "value,size",
+        [
+            (0, 1),
+            (-1, 1),
+            (127, 1),
+            (-128, 1),
+            (128, 2),
+            (-129, 2),
+            (32_767, 2),
+            (-32_768, 2),
+            (32_768, 4),
+            (-32_769, 4),
+            (2_147_483_647, 4),
+            (-2_147_483_648, 4),
+        ],
+    )
+    def test_encode_message_int_size(self, value, size):
+        data = encode_message(200, value)
+        assert data[2] == 0x60 | size
+        assert len(data) == 3 + size
+        assert decode_message(data) == (200, value)
+
+    @pytest.mark.parametrize("value", [2_147_483_648, -2_147_483_649])
+    def test_encode_message_int_out_of_range(self, value):
+        with pytest.raises(ValueError):
+            encode_message(200, value)
+
+    def test_encode_message_int_subclass(self):
+        class Number(IntEnum):
+            FIVE = 5
+
+        data = encode_message(200, Number.FIVE)
+        assert data == b"\xc8\x00\x61\x05"
 
-    def test_encode_message_empty(self):
-        data = encode_message(200)
-        assert data == b"\xc8"
+    def test_encode_message_unsupported(self):
+        with pytest.raises(ValueError):
+            encode_message(200, None)  # type: ignore[arg-type]
+
+    def test_encode_message_too_large(self):
+        with pytest.raises(ValueError):
+            encode_message(200, b"\x00" * OBSERVED_DATA_MAX_SIZE)
+
+
+class TestPybricksBleRoundTrip:
+    @given(
+        channel=st.integers(0, 255),
+        values=st.lists(
+            st.one_of(
+                st.booleans(),
+                st.integers(-(2**31), 2**31 - 1),
+                st.floats(width=32, allow_nan=False),
+                st.text(max_size=8),
+                st.binary(max_size=8),
+            ),
+            max_size=5,
+        ),
+    )
+    def test_encode_decode_roundtrip(self, channel, values):
+        try:
+            message = encode_message(channel, *values)
+        except ValueError as e:
+            if not str(e).startswith("Payload too large"):
+                raise
+            reject()
+
+        decoded_channel, data = decode_message(message)
+
+        assert decoded_channel == channel
+        assert data == (values[0] if len(values) == 1 else tuple(values))
+
+    def test_encode_decode_str_utf8(self):
+        data = encode_message(200, "é")
+        assert data == b"\xc8\x00\xa2\xc3\xa9"
+        assert decode_message(data) == (200, "é")
+
+
+class TestPybricksBleEncodeMessageInto:
+    def test_encode_message_into(self):
+        buf = bytearray(ENCODED_MESSAGE_MAX_SIZE)
+        size = encode_message_into(buf, 200, "NTF", True, False)
+        assert buf[:size] == b"\xc8\xa3NTF @"
+
+    def test_encode_message_into_reuse(self):
+        buf = bytearray(ENCODED_MESSAGE_MAX_SIZE)
+        encode_message_into(buf, 200, "bytes", b"\x00\xc4\x81")
+        size = encode_message_into(buf, 200, 5)
+        assert buf[:size] == b"\xc8\x00\x61\x05"
+
+    def test_encode_message_into_buffer_too_small(self):
+        buf = bytearray(4)
+        with pytest.raises(ValueError):
+            encode_message_into(buf, 200, "NTF")
+        assert len(buf) == 4
+
+
+class TestPybricksBleIntMessageEncoder:
+    @pytest.mark.parametrize(
+        "value",
+        [0, -1, 127, -128, 128, -129, 32_768, -32_769, 2_147_483_647, -2_147_483_648],
+    )
+    def test_encode_int_message(self, value):
+        encode = _make_int_message_encoder(200)
+        assert encode(value) == encode_message(200, value)
+
+    @pytest.mark.parametrize("value", [2_147_483_648, -2_147_483_649])
+    def test_encode_int_message_out_of_range(self, value):
+        encode = _make_int_message_encoder(200)
+        with pytest.raises(ValueError):
+            encode(value)
 
 
 class TestPybricksBlePnpId:
@@ -163,7 +295,7 @@ class TestPybricksBlePnpId:
         assert pnp_id == b"\x01\x97\x03\x00\x00\x00\x00"
 
     def test_unpack_pnp_id(self):
-        pnp_id = pack_pnp_id(0x00, 0x00, vendor_id_type="BT", vendor_id=LEGO_CID)
+        pnp_id = b"\x01\x97\x03\x00\x00\x00\x00"
         (vid_type, vid, pid, rev) = unpack_pnp_id(pnp_id)
         assert vid_type == "BT"
         assert vid == LEGO_CID
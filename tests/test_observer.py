@@ -1,9 +1,17 @@
+import asyncio
+
 import pytest
 import pytest_asyncio
+from bleak import AdvertisementData, BLEDevice
 
+from pb_ble import LEGO_CID
 from pb_ble.bluezdbus import (
     BlueZPybricksObserver,
+    ObservedAdvertisement,
 )
+from pb_ble.messages import encode_message
+
+pytestmark = pytest.mark.bluez
 
 
 def get_adapter1(adapter):
@@ -11,8 +19,8 @@ def get_adapter1(adapter):
 
 
 class TestPassiveBlueZObserver:
-    @pytest_asyncio.fixture(autouse=True)
-    async def require_passive_scan(sef, adapter_details, adapter_name):
+    @pytest.fixture(autouse=True)
+    def require_passive_scan(self, adapter_details, adapter_name):
         if not adapter_details["passive_scan"]:
             pytest.skip(
                 reason=f"Bluetooth adapter '{adapter_name}' does not support BLE passive scanning"
@@ -64,6 +72,11 @@ class TestActiveBlueZObserver:
         assert observer.rssi_threshold is None
         assert observer.device_pattern == "Name"
 
+    @pytest.mark.parametrize("channel", [-1, 256])
+    def test_create_observer_invalid_channel(self, channel):
+        with pytest.raises(ValueError):
+            BlueZPybricksObserver(scanning_mode="active", channels=[channel])
+
     async def test_observe(self, adapter, observer):
         # WHEN a channel is observed
         data = observer.observe(0)
@@ -74,3 +87,50 @@ class TestActiveBlueZObserver:
         # AND the bluetooth adapter should be discovering (active scan)
         discovering = await get_adapter1(adapter).get_discovering()
         assert discovering is True
+
+    async def test_clear(self, observer):
+        # GIVEN an observed broadcast
+        observer.advertisements[1] = ObservedAdvertisement(5, -50)
+        assert observer.observe(1) is not None
+
+        # WHEN the observer is cleared
+        observer.clear()
+
+        # THEN there should be no data
+        assert observer.observe(1) is None
+
+    async def test_wait(self, observer):
+        # GIVEN a pending wait for a broadcast on channel 1
+        waiter = asyncio.ensure_future(observer.wait(1))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        # WHEN a broadcast on channel 1 is received
+        observer._callback(
+            BLEDevice("00:00:00:00:00:00", None, None),
+            AdvertisementData(
+                local_name=None,
+                manufacturer_data={LEGO_CID: encode_message(1, 5)},
+                service_data={},
+                service_uuids=[],
+                tx_power=None,
+                rssi=-50,
+                platform_data=(),
+            ),
+        )
+
+        # THEN the wait returns the broadcast
+        assert await waiter == ObservedAdvertisement(5, -50)
+
+    async def test_wait_stopped(self):
+        # GIVEN a pending wait for a broadcast on channel 1
+        async with BlueZPybricksObserver(scanning_mode="active") as observer:
+            waiter = asyncio.ensure_future(observer.wait(1))
+            await asyncio.sleep(0)
+            assert not waiter.done()
+
+        # WHEN the observer is stopped
+        # THEN the wait is cancelled
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert not observer._waiters
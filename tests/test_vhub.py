@@ -3,31 +3,65 @@ import pytest_asyncio
 
 from pb_ble import get_virtual_ble
 
+pytestmark = pytest.mark.bluez
 
-@pytest_asyncio.fixture(autouse=True)
-async def require_ble(adapter_details, adapter_name):
+
+@pytest.fixture(autouse=True)
+def require_ble(adapter_details, adapter_name):
     if not adapter_details["advertise"] or not adapter_details["passive_scan"]:
         pytest.skip(
             reason=f"Bluetooth adapter '{adapter_name}' does not support BLE capabilities"
         )
 
 
+@pytest_asyncio.fixture
+async def vble():
+    async with await get_virtual_ble(broadcast_channel=1, observe_channels=[2]) as vble:
+        yield vble
+
+
 class TestVirtualBLE:
     async def test_create_vble(self, adapter):
-        ble = await get_virtual_ble(broadcast_channel=1, observe_channels=[2])
-        assert ble is not None
+        async with await get_virtual_ble(
+            broadcast_channel=1, observe_channels=[2]
+        ) as ble:
+            assert ble is not None
 
-    async def test_observe(self):
-        ble = await get_virtual_ble(broadcast_channel=1, observe_channels=[2])
-        data = ble.observe(2)
+    async def test_observe(self, vble):
+        data = vble.observe(2)
         assert data is None
 
-    async def test_broadcast(self):
-        ble = await get_virtual_ble(broadcast_channel=1, observe_channels=[2])
-        await ble.broadcast(42)
+    async def test_observe_with_rssi(self, vble):
+        advertisement = vble.observe_with_rssi(2)
+        assert advertisement is None
+
+    @pytest.mark.parametrize(
+        "data",
+        [42, (42, 24), 3.5, "NTF", b"\x00\xc4", True],
+    )
+    async def test_broadcast(self, vble, data):
+        await vble.broadcast(data)
+        assert vble._adv.message == data
+        assert vble._broadcaster.is_broadcasting(vble._adv)
+
+    async def test_shared_connection(self):
+        async with (
+            await get_virtual_ble(broadcast_channel=1) as ble1,
+            await get_virtual_ble(broadcast_channel=2) as ble2,
+        ):
+            assert ble1._broadcaster.bus is ble2._broadcaster.bus
+            assert ble1._broadcaster.bus.connected
+
+        assert not ble1._broadcaster.bus.connected
 
     async def test_context(self):
         async with await get_virtual_ble(
             broadcast_channel=1, observe_channels=[2]
         ) as ble:
             assert ble.version() is not None
+
+    async def test_broadcast_stop(self, vble):
+        # stopping is a no-op if not broadcasting
+        await vble.broadcast(None)
+        await vble.broadcast(42)
+        await vble.broadcast(None)
@@ -5,18 +5,21 @@ List available Bluetooth adapters
 import asyncio
 from pprint import pp
 
-from bluetooth_adapters import get_adapters, get_dbus_managed_objects
+from bluetooth_adapters import get_adapters
 
 adapters = get_adapters()
 
 
 async def run():
-    dbus_objs = await get_dbus_managed_objects()
-    pp(dbus_objs)
+    # Refreshing the adapters queries all objects managed by BlueZ,
+    # so reuse that result rather than querying them again
     await adapters.refresh()
-    pp(adapters.adapters)
-    pp(adapters._bluez.adapters)  # type: ignore # _bluez is a private member
-    pp(adapters._bluez._packed_managed_objects)  # type: ignore # _bluez is a private member
+    pp(
+        {
+            "managed_objects": adapters._bluez.unpacked_managed_objects,  # type: ignore # _bluez is a private member
+            "adapters": adapters.adapters,
+        }
+    )
 
 
 asyncio.run(run())
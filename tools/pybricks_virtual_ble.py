@@ -5,31 +5,32 @@ An example showing a "Virtual Hub BLE radio" operating in Python.
 import asyncio
 import random
 
-from async_timer.pacemaker import TimerPacemaker
-from pybricks import _common
-
-from pb_ble import get_virtual_ble
+from pb_ble import VirtualBLE, get_virtual_ble
 from pb_ble.constants import ScanningMode
 
 
-async def observe(vble: _common.BLE, observe_channel: int, interval: float = 1.0):
+async def observe(vble: VirtualBLE, observe_channel: int):
     """
-    Coroutine that polls and prints broadcasting data
-    on the given interval.
+    Coroutine that prints broadcasting data
+    as soon as it is received.
     """
-    async for _ in TimerPacemaker(delay=interval):
-        data = vble.observe(observe_channel)
-        rssi = vble.signal_strength(observe_channel)
-        if data:
-            print(f"Observation: '{data}' [{rssi} dBm]")
+    while True:
+        data, rssi = await vble.wait_for_observation(observe_channel)
+        print(f"Observation: {data!r} [{rssi} dBm]")
 
 
-async def broadcast(vble: _common.BLE, interval: float = 10.0):
+async def broadcast(vble: VirtualBLE, interval: float = 10.0):
     """
     Coroutine that broadcasts a new random number
     on the given interval.
     """
-    async for _ in TimerPacemaker(delay=interval):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    while True:
+        # sleep until the next deadline, so the interval does not drift
+        await asyncio.sleep(max(0, deadline - loop.time()))
+        deadline += interval
+
         val = random.randint(0, 3)
         await vble.broadcast(val)
         print(f"Broadcasting: '{val}'")
@@ -48,10 +49,7 @@ async def main():
         observe_channels=[observe_channel],
         scanning_mode=scanning_mode,
     ) as vble:
-        observe_task = asyncio.create_task(observe(vble, observe_channel))
-        broadcast_task = asyncio.create_task(broadcast(vble))
-
-        await asyncio.gather(observe_task, broadcast_task)
+        await asyncio.gather(observe(vble, observe_channel), broadcast(vble))
 
 
 asyncio.run(main())